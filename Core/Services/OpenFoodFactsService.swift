@@ -61,18 +61,21 @@ struct OFFNutriments: Decodable, Sendable {
 }
 
 // OFF bazen sayıları string olarak döndürüyor. Her iki formu da karşılayan decoder.
+// String olarak gelen "nan"/"inf" gibi sonlu olmayan değerler nil'e düşer, böylece çağıran taraf 0'a döner.
 struct OFFNumeric: Decodable, Sendable {
     let value: Double?
 
     init(from decoder: Decoder) throws {
         let container = try decoder.singleValueContainer()
         if let d = try? container.decode(Double.self) {
-            value = d
+            // Savunma amaçlı: JSONDecoder varsayılan .throw stratejisiyle bu yola NaN/Inf hiç ulaşmaz.
+            value = d.isFinite ? d : nil
             return
         }
         if let s = try? container.decode(String.self) {
             let normalized = s.replacingOccurrences(of: ",", with: ".")
-            value = Double(normalized.trimmingCharacters(in: .whitespacesAndNewlines))
+            let parsed = Double(normalized.trimmingCharacters(in: .whitespacesAndNewlines))
+            value = parsed.flatMap { $0.isFinite ? $0 : nil }
             return
         }
         value = nil
@@ -95,36 +98,35 @@ struct OpenFoodFactsLookupResult {
 final class OpenFoodFactsService {
     // MARK: - Configuration
     private let baseURL = URL(string: "https://world.openfoodfacts.org/api/v2/")!
-    private let userAgent = "Thrustr/1.0 (+https://thrustr.app)"
-    private let timeout: TimeInterval = 10
     private let maxRetries = 3
     private let retryBaseDelay: TimeInterval = 0.5
+    private let maxRetryAfterDelay: TimeInterval = 5
     private let session: URLSession
-    
-    // PERFORMANCE: Network caching
-    private let cache = URLCache(memoryCapacity: 10_000_000, diskCapacity: 50_000_000) // 10MB memory, 50MB disk
-    
+
+    // PERFORMANCE: One session (and URL cache) shared by every service instance, so
+    // view models that create their own service still reuse keep-alive connections
+    // instead of paying a fresh TCP + TLS handshake per lookup.
+    private static let sharedSession: URLSession = {
+        let timeout: TimeInterval = 10
+        let sessionConfig = URLSessionConfiguration.default
+        sessionConfig.urlCache = URLCache(memoryCapacity: 10_000_000, diskCapacity: 50_000_000) // 10MB memory, 50MB disk
+        sessionConfig.requestCachePolicy = .returnCacheDataElseLoad
+        sessionConfig.timeoutIntervalForRequest = timeout
+        sessionConfig.timeoutIntervalForResource = timeout
+        sessionConfig.httpAdditionalHeaders = [
+            "User-Agent": "Thrustr/1.0 (+https://thrustr.app)",
+            "Accept": "application/json"
+        ]
+        return URLSession(configuration: sessionConfig)
+    }()
+
     // MARK: - Published state (aligning with app patterns)
     var isLoading: Bool = false
     var lastError: Error?
 
     // MARK: - Public API
     init(session: URLSession? = nil) {
-        if let session {
-            self.session = session
-        } else {
-            // PERFORMANCE: Use default config with caching instead of ephemeral
-            let sessionConfig = URLSessionConfiguration.default
-            sessionConfig.urlCache = cache
-            sessionConfig.requestCachePolicy = .returnCacheDataElseLoad
-            sessionConfig.timeoutIntervalForRequest = timeout
-            sessionConfig.timeoutIntervalForResource = timeout
-            sessionConfig.httpAdditionalHeaders = [
-                "User-Agent": userAgent,
-                "Accept": "application/json"
-            ]
-            self.session = URLSession(configuration: sessionConfig)
-        }
+        self.session = session ?? Self.sharedSession
     }
 
     func fetchProduct(barcode: String, modelContext: ModelContext, preferTurkish: Bool = true) async throws -> OpenFoodFactsLookupResult {
@@ -173,8 +175,9 @@ final class OpenFoodFactsService {
         var request = URLRequest(url: url)
         request.httpMethod = "GET"
 
-        let (data, response) = try await session.data(for: request)
-        guard let http = response as? HTTPURLResponse, (200...299).contains(http.statusCode) else {
+        let (data, http) = try await dataWithRetry(for: request)
+        if http.statusCode == 429 { throw OpenFoodFactsError.rateLimited }
+        guard (200...299).contains(http.statusCode) else {
             throw OpenFoodFactsError.invalidResponse
         }
 
@@ -241,94 +244,91 @@ final class OpenFoodFactsService {
         ]
         guard let finalURL = components.url else { throw OpenFoodFactsError.invalidResponse }
 
-        var lastError: Error?
-        for attempt in 0...maxRetries {
-            do {
-                var request = URLRequest(url: finalURL)
-                request.httpMethod = "GET"
-
-                let (data, response) = try await session.data(for: request)
-                guard let http = response as? HTTPURLResponse else { throw OpenFoodFactsError.invalidResponse }
+        var request = URLRequest(url: finalURL)
+        request.httpMethod = "GET"
 
-                // Retry on 429/5xx with exponential backoff
-                if http.statusCode == 429 || (500...599).contains(http.statusCode) {
-                    if attempt < maxRetries {
-                        try await Self.sleepForBackoff(base: retryBaseDelay, attempt: attempt)
-                        continue
-                    } else {
-                        if http.statusCode == 429 { throw OpenFoodFactsError.rateLimited }
-                        throw OpenFoodFactsError.serverError(statusCode: http.statusCode)
-                    }
-                }
+        let (data, http) = try await dataWithRetry(for: request)
+        if http.statusCode == 429 { throw OpenFoodFactsError.rateLimited }
+        guard (200...299).contains(http.statusCode) else {
+            if http.statusCode == 404 { return nil }
+            throw OpenFoodFactsError.serverError(statusCode: http.statusCode)
+        }
 
-                guard (200...299).contains(http.statusCode) else {
-                    if http.statusCode == 404 { return nil }
-                    throw OpenFoodFactsError.serverError(statusCode: http.statusCode)
-                }
+        let decoder = JSONDecoder()
+        let decoded = try decoder.decode(OFFResponse.self, from: data)
+        guard let product = decoded.product else { return nil }
+
+        // Map to Food (100g normalization)
+        let calories = product.nutriments?.energyKcal100g?.value ?? 0
+        let protein = product.nutriments?.protein100g?.value ?? 0
+        let carbs = product.nutriments?.carbs100g?.value ?? 0
+        let fat = product.nutriments?.fat100g?.value ?? 0
+
+        // Names: prefer localized name; fallback chain
+        let displayName = product.product_name?.trimmingCharacters(in: .whitespacesAndNewlines)
+        let nameTR = lc == "tr" ? (displayName ?? "") : ""
+        let nameEN = lc == "en" ? (displayName ?? "") : (displayName ?? "")
+
+        let food = Food(
+            nameEN: nameEN,
+            nameTR: nameTR,
+            calories: calories,
+            protein: protein,
+            carbs: carbs,
+            fat: fat,
+            category: .other
+        )
+        if let brand = product.brands, !brand.isEmpty {
+            food.brand = brand
+        }
+        food.source = .openFoodFacts
+        food.barcode = product.code ?? barcode
+        if let img = product.image_small_url, !img.isEmpty { food.imageUrlString = img }
+        if let ts = product.last_modified_t { food.lastModified = Date(timeIntervalSince1970: ts) }
+        if let s = product.serving_size, let grams = Self.parseServingSizeToGrams(s) { food.servingSizeGrams = grams }
+
+        let imageURL = URL(string: product.image_small_url ?? "")
+        let lastModified: Date? = {
+            guard let ts = product.last_modified_t else { return nil }
+            return Date(timeIntervalSince1970: ts)
+        }()
+
+        // OFF quality score is not directly provided in this minimal payload.
+        return OpenFoodFactsLookupResult(
+            food: food,
+            barcode: product.code ?? barcode,
+            imageURL: imageURL,
+            lastModified: lastModified,
+            qualityScore: nil,
+            locale: product.lc ?? lc
+        )
+    }
 
-                let decoder = JSONDecoder()
-                let decoded = try decoder.decode(OFFResponse.self, from: data)
-                guard let product = decoded.product else { return nil }
-
-                // Map to Food (100g normalization)
-                let calories = product.nutriments?.energyKcal100g?.value ?? 0
-                let protein = product.nutriments?.protein100g?.value ?? 0
-                let carbs = product.nutriments?.carbs100g?.value ?? 0
-                let fat = product.nutriments?.fat100g?.value ?? 0
-
-                // Names: prefer localized name; fallback chain
-                let displayName = product.product_name?.trimmingCharacters(in: .whitespacesAndNewlines)
-                let nameTR = lc == "tr" ? (displayName ?? "") : ""
-                let nameEN = lc == "en" ? (displayName ?? "") : (displayName ?? "")
-
-                let food = Food(
-                    nameEN: nameEN,
-                    nameTR: nameTR,
-                    calories: calories,
-                    protein: protein,
-                    carbs: carbs,
-                    fat: fat,
-                    category: .other
-                )
-                if let brand = product.brands, !brand.isEmpty {
-                    food.brand = brand
-                }
-                food.source = .openFoodFacts
-                food.barcode = product.code ?? barcode
-                if let img = product.image_small_url, !img.isEmpty { food.imageUrlString = img }
-                if let ts = product.last_modified_t { food.lastModified = Date(timeIntervalSince1970: ts) }
-                if let s = product.serving_size, let grams = Self.parseServingSizeToGrams(s) { food.servingSizeGrams = grams }
-
-                let imageURL = URL(string: product.image_small_url ?? "")
-                let lastModified: Date? = {
-                    guard let ts = product.last_modified_t else { return nil }
-                    return Date(timeIntervalSince1970: ts)
-                }()
-
-                // OFF quality score is not directly provided in this minimal payload.
-                let result = OpenFoodFactsLookupResult(
-                    food: food,
-                    barcode: product.code ?? barcode,
-                    imageURL: imageURL,
-                    lastModified: lastModified,
-                    qualityScore: nil,
-                    locale: product.lc ?? lc
-                )
+    /// Performs the request, retrying 429/5xx responses and transient network errors with backoff.
+    /// Returns the final response so callers can map its status code.
+    private func dataWithRetry(for request: URLRequest) async throws -> (Data, HTTPURLResponse) {
+        var attempt = 0
+        while true {
+            do {
+                let (data, response) = try await session.data(for: request)
+                guard let http = response as? HTTPURLResponse else { throw OpenFoodFactsError.invalidResponse }
 
-                return result
-            } catch {
-                lastError = error
-                // Network timeouts or transient errors → retry with backoff
-                if attempt < maxRetries, (error as? URLError)?.code == .timedOut || (error as? URLError)?.code == .networkConnectionLost {
-                    try await Self.sleepForBackoff(base: retryBaseDelay, attempt: attempt)
+                // Retry on 429/5xx; OFF may tell us how long to wait via Retry-After
+                if attempt < maxRetries, http.statusCode == 429 || (500...599).contains(http.statusCode) {
+                    let retryAfter = Self.retryAfterDelay(from: http)
+                    // Server wants a longer pause than we block a lookup for → give up now
+                    if let retryAfter, retryAfter > maxRetryAfterDelay { return (data, http) }
+                    try await Self.sleepForBackoff(base: retryBaseDelay, attempt: attempt, retryAfter: retryAfter)
+                    attempt += 1
                     continue
                 }
-                throw error
+                return (data, http)
+            } catch let error as URLError where attempt < maxRetries && (error.code == .timedOut || error.code == .networkConnectionLost) {
+                // Network timeouts or transient errors → retry with backoff
+                try await Self.sleepForBackoff(base: retryBaseDelay, attempt: attempt)
+                attempt += 1
             }
         }
-
-        if let lastError { throw lastError }
-        return nil
     }
 
     // MARK: - Helpers
@@ -340,12 +340,25 @@ final class OpenFoodFactsService {
         return allowedLengths.contains(trimmed.count) && CharacterSet.decimalDigits.isSuperset(of: CharacterSet(charactersIn: trimmed))
     }
 
-    private static func sleepForBackoff(base: TimeInterval, attempt: Int) async throws {
+    private static func sleepForBackoff(base: TimeInterval, attempt: Int, retryAfter: TimeInterval? = nil) async throws {
         let jitter = TimeInterval.random(in: 0...0.2)
-        let delay = pow(2.0, Double(attempt)) * base + jitter
+        let delay = retryAfter ?? (pow(2.0, Double(attempt)) * base + jitter)
         try await Task.sleep(nanoseconds: UInt64(delay * 1_000_000_000))
     }
 
+    /// Parses `Retry-After` as delta-seconds or an HTTP-date.
+    nonisolated static func retryAfterDelay(from response: HTTPURLResponse, now: Date = Date()) -> TimeInterval? {
+        guard let raw = response.value(forHTTPHeaderField: "Retry-After")?
+            .trimmingCharacters(in: .whitespaces), !raw.isEmpty else { return nil }
+        if let seconds = TimeInterval(raw) { return max(0, seconds) }
+        let formatter = DateFormatter()
+        formatter.locale = Locale(identifier: "en_US_POSIX")
+        formatter.timeZone = TimeZone(identifier: "GMT")
+        formatter.dateFormat = "EEE, dd MMM yyyy HH:mm:ss zzz"
+        guard let date = formatter.date(from: raw) else { return nil }
+        return max(0, date.timeIntervalSince(now))
+    }
+
     // MARK: - Serving size parsing
     /// OFF "serving_size" may be like "30 g", "1 cup (125 g)", "200ml". We try to extract grams.
     private static func parseServingSizeToGrams(_ raw: String) -> Double? {
@@ -6,17 +6,20 @@ final class OpenFoodFactsServiceTests: XCTestCase {
     private class MockURLProtocol: URLProtocol {
         static var response: (Int, Data)?
         static var responsesQueue: [(Int, Data)] = []
+        static var headerFields: [String: String]?
+        static var requestCount = 0
         override class func canInit(with request: URLRequest) -> Bool { true }
         override class func canonicalRequest(for request: URLRequest) -> URLRequest { request }
         override func startLoading() {
+            MockURLProtocol.requestCount += 1
             if !MockURLProtocol.responsesQueue.isEmpty {
                 let (status, data) = MockURLProtocol.responsesQueue.removeFirst()
-                let resp = HTTPURLResponse(url: request.url!, statusCode: status, httpVersion: nil, headerFields: nil)!
+                let resp = HTTPURLResponse(url: request.url!, statusCode: status, httpVersion: nil, headerFields: MockURLProtocol.headerFields)!
                 client?.urlProtocol(self, didReceive: resp, cacheStoragePolicy: .notAllowed)
                 client?.urlProtocol(self, didLoad: data)
                 client?.urlProtocolDidFinishLoading(self)
             } else if let (status, data) = MockURLProtocol.response {
-                let resp = HTTPURLResponse(url: request.url!, statusCode: status, httpVersion: nil, headerFields: nil)!
+                let resp = HTTPURLResponse(url: request.url!, statusCode: status, httpVersion: nil, headerFields: MockURLProtocol.headerFields)!
                 client?.urlProtocol(self, didReceive: resp, cacheStoragePolicy: .notAllowed)
                 client?.urlProtocol(self, didLoad: data)
                 client?.urlProtocolDidFinishLoading(self)
@@ -82,6 +85,119 @@ final class OpenFoodFactsServiceTests: XCTestCase {
         XCTAssertEqual(Int(result.food.calories), 50)
     }
 
+    func testFetchProduct_RetryAfterThenSuccess() async throws {
+        // 503 with Retry-After: 0, then 200
+        let successJSON = """
+        {"status":1,"product":{"code":"1234567890123","product_name":"Retry After Bar","brands":"B","image_small_url":null,"last_modified_t":1700000000,"lc":"en","nutriments":{"energy-kcal_100g":70,"proteins_100g":7,"carbohydrates_100g":9,"fat_100g":2}}}
+        """.data(using: .utf8)!
+        MockURLProtocol.headerFields = ["Retry-After": "0"]
+        defer { MockURLProtocol.headerFields = nil }
+        MockURLProtocol.responsesQueue = [ (503, Data()), (200, successJSON) ]
+        let service = OpenFoodFactsService(session: makeSession())
+        let container = try XCTUnwrap(try? ModelContainer(for: Food.self))
+        let result = try await service.fetchProduct(barcode: "1234567890123", modelContext: container.mainContext, preferTurkish: false)
+        XCTAssertEqual(result.food.nameEN, "Retry After Bar")
+    }
+
+    func testFetchProduct_PersistentRateLimit_ThrowsRateLimited() async throws {
+        MockURLProtocol.headerFields = ["Retry-After": "0"]
+        MockURLProtocol.responsesQueue = []
+        MockURLProtocol.response = (429, Data())
+        MockURLProtocol.requestCount = 0
+        defer {
+            MockURLProtocol.headerFields = nil
+            MockURLProtocol.response = nil
+        }
+        let service = OpenFoodFactsService(session: makeSession())
+        let container = try XCTUnwrap(try? ModelContainer(for: Food.self))
+        do {
+            _ = try await service.fetchProduct(barcode: "1234567890123", modelContext: container.mainContext, preferTurkish: false)
+            XCTFail("Expected rate limited")
+        } catch let err as OpenFoodFactsError {
+            XCTAssertEqual(err, .rateLimited)
+        } catch {
+            XCTFail("Unexpected error: \(error)")
+        }
+        XCTAssertEqual(MockURLProtocol.requestCount, 4) // initial attempt + 3 retries
+    }
+
+    func testFetchProduct_RetryAfterAboveCap_GivesUpWithoutRetrying() async throws {
+        MockURLProtocol.headerFields = ["Retry-After": "120"]
+        MockURLProtocol.responsesQueue = []
+        MockURLProtocol.response = (429, Data())
+        MockURLProtocol.requestCount = 0
+        defer {
+            MockURLProtocol.headerFields = nil
+            MockURLProtocol.response = nil
+        }
+        let service = OpenFoodFactsService(session: makeSession())
+        let container = try XCTUnwrap(try? ModelContainer(for: Food.self))
+        do {
+            _ = try await service.fetchProduct(barcode: "1234567890123", modelContext: container.mainContext, preferTurkish: false)
+            XCTFail("Expected rate limited")
+        } catch let err as OpenFoodFactsError {
+            XCTAssertEqual(err, .rateLimited)
+        } catch {
+            XCTFail("Unexpected error: \(error)")
+        }
+        XCTAssertEqual(MockURLProtocol.requestCount, 1)
+    }
+
+    func testSearchProducts_RetryThenSuccess() async throws {
+        let searchJSON = """
+        {"products":[{"code":"1234567890123","product_name":"Search Bar","brands":"B","image_small_url":null,"last_modified_t":1700000000,"lc":"en","nutriments":{"energy-kcal_100g":80,"proteins_100g":8,"carbohydrates_100g":12,"fat_100g":3}}]}
+        """.data(using: .utf8)!
+        MockURLProtocol.responsesQueue = [ (503, Data()), (200, searchJSON) ]
+        MockURLProtocol.requestCount = 0
+        let service = OpenFoodFactsService(session: makeSession())
+        let results = try await service.searchProducts(query: "bar", lc: "en")
+        XCTAssertEqual(results.count, 1)
+        XCTAssertEqual(results.first?.food.nameEN, "Search Bar")
+        XCTAssertEqual(MockURLProtocol.requestCount, 2)
+    }
+
+    func testSearchProducts_PersistentRateLimit_ThrowsRateLimited() async throws {
+        MockURLProtocol.headerFields = ["Retry-After": "0"]
+        MockURLProtocol.responsesQueue = []
+        MockURLProtocol.response = (429, Data())
+        defer {
+            MockURLProtocol.headerFields = nil
+            MockURLProtocol.response = nil
+        }
+        let service = OpenFoodFactsService(session: makeSession())
+        do {
+            _ = try await service.searchProducts(query: "bar", lc: "en")
+            XCTFail("Expected rate limited")
+        } catch let err as OpenFoodFactsError {
+            XCTAssertEqual(err, .rateLimited)
+        } catch {
+            XCTFail("Unexpected error: \(error)")
+        }
+    }
+
+    func testRetryAfterDelay_Parsing() {
+        let url = URL(string: "https://world.openfoodfacts.org")!
+        let seconds = HTTPURLResponse(url: url, statusCode: 429, httpVersion: nil, headerFields: ["Retry-After": "3"])!
+        XCTAssertEqual(OpenFoodFactsService.retryAfterDelay(from: seconds), 3)
+
+        let now = Date(timeIntervalSince1970: 1_700_000_000)
+        let httpDate = HTTPURLResponse(url: url, statusCode: 503, httpVersion: nil, headerFields: ["Retry-After": "Tue, 14 Nov 2023 22:13:30 GMT"])!
+        XCTAssertEqual(OpenFoodFactsService.retryAfterDelay(from: httpDate, now: now), 10)
+
+        let missing = HTTPURLResponse(url: url, statusCode: 429, httpVersion: nil, headerFields: nil)!
+        XCTAssertNil(OpenFoodFactsService.retryAfterDelay(from: missing))
+    }
+
+    func testNutrimentsDecoding_NonFiniteStringValues() throws {
+        let json = """
+        {"energy-kcal_100g":"120,5","proteins_100g":"nan","carbohydrates_100g":"inf"}
+        """.data(using: .utf8)!
+        let nutriments = try JSONDecoder().decode(OFFNutriments.self, from: json)
+        XCTAssertEqual(nutriments.energyKcal100g?.value, 120.5)
+        XCTAssertNil(nutriments.protein100g?.value)
+        XCTAssertNil(nutriments.carbs100g?.value)
+    }
+
     func testFetchProduct_TRtoENFallback() async throws {
         // Simulate TR 404 then EN 200
         let enJSON = """